@@ -177,9 +177,9 @@ pub fn handle_command(
 /// Core command dispatch that takes pre-borrowed Option refs (works with both owned and Rc<RefCell> fields).
 pub fn handle_command_rc(
     req: &CommandRequest,
-    scene_world: Option<&mut SceneWorld>,
+    mut scene_world: Option<&mut SceneWorld>,
     event_bus: &mut EventBus,
-    input_state: Option<&mut InputState>,
+    mut input_state: Option<&mut InputState>,
     paused: &mut bool,
 ) -> CommandResponse {
     match req.cmd.as_str() {
@@ -210,6 +210,15 @@ pub fn handle_command_rc(
             None => CommandResponse::error("No input state"),
         },
         "runtime_control" => cmd_runtime_control(req, paused),
+        "batch" => run_batch(req, |op| {
+            handle_command_rc(
+                op,
+                scene_world.as_deref_mut(),
+                event_bus,
+                input_state.as_deref_mut(),
+                paused,
+            )
+        }),
         _ => CommandResponse::error(format!("Unknown command: {}", req.cmd)),
     }
 }
@@ -240,7 +249,8 @@ fn cmd_list_entities(sw: &SceneWorld) -> CommandResponse {
     let entities: Vec<Value> = sw.entity_registry.iter().map(|(id, &entity)| {
         let tags = sw.world.get::<&Tags>(entity)
             .map(|t| t.0.clone()).unwrap_or_default();
-        json!({"id": id, "tags": tags})
+        let point_light = sw.world.get::<&PointLight>(entity).is_ok();
+        json!({"id": id, "tags": tags, "point_light": point_light})
     }).collect();
     CommandResponse::ok(json!({"entities": entities}))
 }
@@ -537,6 +547,30 @@ fn cmd_runtime_control(req: &CommandRequest, paused: &mut bool) -> CommandRespon
     }
 }
 
+// --- Batch commands ---
+
+/// Run a `batch` command: dispatch each request in `ops` in order and return
+/// the per-op responses as `{"results": [...]}`. Lets a client apply many
+/// commands in one socket round trip and one frame.
+pub fn run_batch(
+    req: &CommandRequest,
+    mut dispatch: impl FnMut(&CommandRequest) -> CommandResponse,
+) -> CommandResponse {
+    let ops = match req.params.get("ops").and_then(|v| v.as_array()) {
+        Some(ops) => ops,
+        None => return CommandResponse::error("Missing 'ops' array"),
+    };
+    let results: Vec<Value> = ops.iter().map(|op| {
+        let resp = match serde_json::from_value::<CommandRequest>(op.clone()) {
+            Ok(op_req) if op_req.cmd == "batch" => CommandResponse::error("Nested batch is not supported"),
+            Ok(op_req) => dispatch(&op_req),
+            Err(e) => CommandResponse::error(format!("Invalid op: {}", e)),
+        };
+        serde_json::to_value(&resp).unwrap_or(Value::Null)
+    }).collect();
+    CommandResponse::ok(json!({"results": results}))
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -570,6 +604,23 @@ mod tests {
         assert_eq!(resp.status, "ok");
     }
 
+    #[test]
+    fn test_list_entities_flags_point_lights() {
+        let mut scene = SceneWorld::new();
+        let spawn = |id: &str, components: Value| -> CommandRequest {
+            serde_json::from_value(json!({
+                "cmd": "spawn_entity", "entity_id": id, "components": components,
+            })).unwrap()
+        };
+        cmd_spawn_entity(&spawn("sun", json!({"point_light": {"intensity": 5.0}})), &mut scene);
+        cmd_spawn_entity(&spawn("light_box", json!({})), &mut scene);
+        let resp = cmd_list_entities(&scene);
+        let entities = resp.data.unwrap()["entities"].as_array().unwrap().clone();
+        let flag = |id: &str| entities.iter().find(|e| e["id"] == id).unwrap()["point_light"].clone();
+        assert_eq!(flag("sun"), true);
+        assert_eq!(flag("light_box"), false);
+    }
+
     #[test]
     fn test_runtime_control() {
         let mut paused = false;
@@ -591,4 +642,35 @@ mod tests {
         assert_eq!(resp2.status, "ok");
         assert!(!paused);
     }
+
+    #[test]
+    fn test_batch_runs_ops_in_order() {
+        let mut paused = false;
+        let mut event_bus = EventBus::new(16);
+        let req: CommandRequest = serde_json::from_value(json!({
+            "cmd": "batch",
+            "ops": [
+                {"cmd": "runtime_control", "action": "pause"},
+                {"cmd": "no_such_command"},
+                {"cmd": "batch", "ops": []},
+                {"cmd": "runtime_control", "action": "status"},
+            ],
+        })).unwrap();
+        let resp = handle_command_rc(&req, None, &mut event_bus, None, &mut paused);
+        assert_eq!(resp.status, "ok");
+        let results = resp.data.unwrap()["results"].as_array().unwrap().clone();
+        assert_eq!(results.len(), 4);
+        assert_eq!(results[0]["status"], "ok");
+        assert_eq!(results[1]["status"], "error");
+        assert_eq!(results[2]["status"], "error");
+        assert_eq!(results[3]["data"]["paused"], true);
+        assert!(paused);
+    }
+
+    #[test]
+    fn test_batch_missing_ops() {
+        let req = CommandRequest { cmd: "batch".into(), params: HashMap::new() };
+        let resp = run_batch(&req, |_| CommandResponse::ok_empty());
+        assert_eq!(resp.status, "error");
+    }
 }
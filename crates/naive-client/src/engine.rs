@@ -2454,6 +2454,11 @@ let mut scene_world = scene_world.borrow_mut();
                         format!("modify {}", eid)
                     }
                     "set_camera" => "set_camera".to_string(),
+                    "batch" => {
+                        let n = pending.request.params.get("ops")
+                            .and_then(|v| v.as_array()).map_or(0, |ops| ops.len());
+                        format!("batch ({} ops)", n)
+                    }
                     "save_scene" => {
                         let path = pending.request.params.get("path")
                             .and_then(|v| v.as_str()).unwrap_or("scenes/editor_scene.yaml");
@@ -2474,48 +2479,56 @@ let mut scene_world = scene_world.borrow_mut();
                 }
             }
 
-            let response = match cmd {
-                // Enhanced spawn_entity: if it has mesh_renderer, handle at Engine level
-                "spawn_entity" => {
-                    let has_mesh = pending.request.params.get("components")
-                        .and_then(|c| c.get("mesh_renderer"))
-                        .is_some();
-                    if has_mesh {
-                        self.handle_spawn_with_mesh(&pending.request)
-                    } else {
-                        {
-                            let mut sw_opt = self.scene_world.as_ref().map(|rc| rc.borrow_mut());
-                            let mut eb = self.event_bus.borrow_mut();
-                            let mut is_opt = self.input_state.as_ref().map(|rc| rc.borrow_mut());
-                            crate::command::handle_command_rc(
-                                &pending.request,
-                                sw_opt.as_deref_mut(),
-                                &mut *eb,
-                                is_opt.as_deref_mut(),
-                                &mut self.paused,
-                            )
-                        }
-                    }
-                }
-                "save_scene" => self.handle_save_scene(&pending.request),
-                "get_scene_yaml" => self.handle_get_scene_yaml(),
-                "set_camera" => self.handle_set_camera(&pending.request),
-                "editor_status" => self.handle_editor_status(),
-                "run_lua" => self.handle_run_lua(&pending.request),
-                _ => {
+            let response = self.dispatch_command(&pending.request);
+            let _ = pending.responder.send(response);
+        }
+    }
+
+    /// Dispatch one command request, preferring Engine-level handlers.
+    fn dispatch_command(&mut self, req: &crate::command::CommandRequest) -> crate::command::CommandResponse {
+        match req.cmd.as_str() {
+            // Enhanced spawn_entity: if it has mesh_renderer, handle at Engine level
+            "spawn_entity" => {
+                let has_mesh = req.params.get("components")
+                    .and_then(|c| c.get("mesh_renderer"))
+                    .is_some();
+                if has_mesh {
+                    self.handle_spawn_with_mesh(req)
+                } else {
+                    {
                         let mut sw_opt = self.scene_world.as_ref().map(|rc| rc.borrow_mut());
                         let mut eb = self.event_bus.borrow_mut();
                         let mut is_opt = self.input_state.as_ref().map(|rc| rc.borrow_mut());
                         crate::command::handle_command_rc(
-                            &pending.request,
+                            req,
                             sw_opt.as_deref_mut(),
                             &mut *eb,
                             is_opt.as_deref_mut(),
                             &mut self.paused,
                         )
-                    },
-            };
-            let _ = pending.responder.send(response);
+                    }
+                }
+            }
+            // Run batch ops through this same dispatch so Engine-level commands
+            // (spawn with mesh, set_camera, ...) work inside a batch too.
+            "batch" => crate::command::run_batch(req, |op| self.dispatch_command(op)),
+            "save_scene" => self.handle_save_scene(req),
+            "get_scene_yaml" => self.handle_get_scene_yaml(),
+            "set_camera" => self.handle_set_camera(req),
+            "editor_status" => self.handle_editor_status(),
+            "run_lua" => self.handle_run_lua(req),
+            _ => {
+                let mut sw_opt = self.scene_world.as_ref().map(|rc| rc.borrow_mut());
+                let mut eb = self.event_bus.borrow_mut();
+                let mut is_opt = self.input_state.as_ref().map(|rc| rc.borrow_mut());
+                crate::command::handle_command_rc(
+                    req,
+                    sw_opt.as_deref_mut(),
+                    &mut *eb,
+                    is_opt.as_deref_mut(),
+                    &mut self.paused,
+                )
+            }
         }
     }
 
@@ -335,7 +335,7 @@ fn tool_definitions() -> Vec<Value> {
     vec![
         json!({
             "name": "naive_list_entities",
-            "description": "List all entities in the current scene with their IDs and tags",
+            "description": "List all entities in the current scene with their IDs, tags, and whether each is a point light",
             "inputSchema": { "type": "object", "properties": {}, "required": [] }
         }),
         json!({
@@ -13,6 +13,10 @@ Setup:
     3. Start nAIVE engine (it creates /tmp/naive-runtime.sock)
     4. Run this script: python3 telegram_bridge.py
 
+    Optional webhook mode (Telegram pushes updates instead of being polled):
+       export TELEGRAM_WEBHOOK_URL="https://your-public-host"   # proxied to this machine
+       export TELEGRAM_WEBHOOK_PORT=8443                          # local listen port
+
 Usage:
     Send messages to your bot in Telegram:
     - "make it rain" → spawns blue particles, darkens ambient
@@ -23,13 +27,38 @@ Usage:
     - "chaos mode" → randomizes light colors and intensities
 """
 
+import asyncio
+import hmac
+import http.client
 import json
 import os
-import socket
+import queue
+import random
+import re
+import secrets
+import sqlite3
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import h2  # noqa: F401 — enables httpx's HTTP/2 support
+    import httpx
+except ImportError:  # Falls back to the HTTP/1.1 keep-alive pool
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib json module
+    orjson = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Semantic command cache is optional
+    SentenceTransformer = None
 
 # ─────────────────────────────────────────────────────────────
 # Configuration
@@ -38,63 +67,269 @@ import urllib.error
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
 ANTHROPIC_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 NAIVE_SOCKET = os.environ.get("NAIVE_SOCKET", "/tmp/naive-runtime.sock")
-TELEGRAM_API = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}"
+
+# Haiku handles the short NL → JSON translation; Sonnet is only used when
+# Haiku's reply cannot be parsed.
+CLAUDE_MODEL = os.environ.get("CLAUDE_MODEL", "claude-haiku-4-5")
+CLAUDE_FALLBACK_MODEL = os.environ.get("CLAUDE_FALLBACK_MODEL", "claude-sonnet-4-5-20250929")
+
+# Output cap per interpretation. Tokens are billed as generated, not by this
+# limit, so it is sized for large multi-entity requests ("make it rain").
+CLAUDE_MAX_TOKENS = 4096
+
+# Set to an embedding model (e.g. "sentence-transformers/all-MiniLM-L6-v2") to
+# also reuse interpretations of paraphrased requests. Needs sentence-transformers.
+SEMANTIC_CACHE_MODEL = os.environ.get("SEMANTIC_CACHE_MODEL", "")
+
+# Pending /batch requests (Message Batches API) survive restarts in this file
+BATCH_DB = os.environ.get("BRIDGE_BATCH_DB", "/tmp/naive-telegram-batches.db")
+BATCH_POLL_INTERVAL = 30.0
+TELEGRAM_PATH = f"/bot{TELEGRAM_TOKEN}"
+
+# Webhook mode: public HTTPS base URL that forwards to WEBHOOK_PORT on this host
+# (reverse proxy or tunnel). Leave unset to fall back to long polling.
+WEBHOOK_URL = os.environ.get("TELEGRAM_WEBHOOK_URL", "")
+WEBHOOK_PORT = int(os.environ.get("TELEGRAM_WEBHOOK_PORT", "8443"))
+WEBHOOK_SECRET = os.environ.get("TELEGRAM_WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+
+# JSON on the hot paths (engine socket, API bodies, SSE events) goes through
+# these: orjson when installed (C, bytes in/out), stdlib json otherwise.
+if orjson is not None:
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+else:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    json_loads = json.loads  # Accepts bytes as well as str
+
+# ─────────────────────────────────────────────────────────────
+# HTTPS keep-alive pool
+# ─────────────────────────────────────────────────────────────
+
+class HTTPSPool:
+    """Keep-alive HTTPS connections to one host, reused across requests.
+
+    Saves the TCP + TLS handshake on every Telegram/Claude call after the first.
+    """
+
+    def __init__(self, host: str, maxsize: int = 8):
+        self.host = host
+        self._idle = queue.LifoQueue(maxsize)
+
+    def request(self, method: str, path: str, body: bytes = None,
+                headers: dict = None, timeout: float = 60, on_line=None) -> tuple:
+        """Send a request and return (status, body bytes).
+
+        With `on_line`, a 200 response is streamed instead: each line is passed
+        to the callback as it arrives and the returned body is empty.
+        """
+        try:
+            conn, reused = self._idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._connect(timeout), False
+        try:
+            status, data = self._send(conn, method, path, body, headers, timeout, on_line)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry once fresh.
+            conn = self._connect(timeout)
+            status, data = self._send(conn, method, path, body, headers, timeout, on_line)
+        except Exception:
+            conn.close()
+            raise
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+        return status, data
+
+    def _connect(self, timeout: float) -> http.client.HTTPSConnection:
+        return http.client.HTTPSConnection(self.host, timeout=timeout)
+
+    @staticmethod
+    def _send(conn, method, path, body, headers, timeout, on_line) -> tuple:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request(method, path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        if on_line is None or resp.status != 200:
+            return resp.status, resp.read()
+        delivered = False
+        try:
+            for line in resp:
+                on_line(line)
+                delivered = True
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+            if not delivered:
+                raise
+            # The callback has already acted on part of the stream; resending
+            # would replay those lines, so this must not look retryable.
+            raise ConnectionError("connection lost mid-stream") from e
+        return resp.status, b""
+
+
+TELEGRAM_HTTP = HTTPSPool("api.telegram.org")
+ANTHROPIC_HTTP = HTTPSPool("api.anthropic.com")
+
+# With httpx[http2] installed, concurrent Claude calls (several chats, batch
+# polling) multiplex as HTTP/2 streams over one connection instead.
+ANTHROPIC_H2 = httpx.AsyncClient(
+    base_url="https://api.anthropic.com",
+    http2=True,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+    timeout=30.0,
+) if httpx is not None else None
 
 # ─────────────────────────────────────────────────────────────
 # nAIVE Engine Communication
 # ─────────────────────────────────────────────────────────────
 
-def send_naive_command(cmd: dict) -> dict:
+class NaiveClient:
+    """One long-lived connection to nAIVE's Unix domain socket.
+
+    The engine answers each newline-terminated request with one response line,
+    in order, so requests share the connection one at a time under a lock.
+    Framing is left to asyncio's StreamReader, which buffers into a bytearray
+    and keeps any bytes past the newline for the next read.
+    """
+
+    # Longest response line accepted. StreamReader's 64 KiB default is smaller
+    # than a list_entities dump for a few hundred entities.
+    READ_LIMIT = 16 * 1024 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+        # Whether the engine understands {"cmd": "batch", "ops": [...]};
+        # re-checked after every reconnect in case the engine was swapped.
+        self.supports_batch = True
+
+    async def send(self, cmd: dict) -> dict:
+        """Send one command and return the engine's response."""
+        async with self._lock:
+            try:
+                return await self._roundtrip(cmd)
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                # Engine restarted or dropped the connection; reconnect once.
+                self._close()
+                return await self._roundtrip(cmd)
+
+    async def _roundtrip(self, cmd: dict) -> dict:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(self.path, limit=self.READ_LIMIT), timeout=5.0)
+            self.supports_batch = True
+        try:
+            self._writer.write(json_dumps(cmd) + b"\n")
+            await self._writer.drain()
+            line = await asyncio.wait_for(self._reader.readuntil(b"\n"), timeout=5.0)
+        except Exception:
+            # A late reply would be read as the answer to the next request
+            self._close()
+            raise
+        return json_loads(line)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+_CLIENT = NaiveClient(NAIVE_SOCKET)
+
+
+async def send_naive_command(cmd: dict) -> dict:
     """Send a JSON command to nAIVE's Unix domain socket and return the response."""
     try:
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.settimeout(5.0)
-        sock.connect(NAIVE_SOCKET)
-        payload = json.dumps(cmd) + "\n"
-        sock.sendall(payload.encode("utf-8"))
-        response = b""
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            response += chunk
-            if b"\n" in chunk:
-                break
-        sock.close()
-        return json.loads(response.decode("utf-8").strip())
+        return await _CLIENT.send(cmd)
     except Exception as e:
         return {"status": "error", "message": str(e)}
+    finally:
+        ops = cmd.get("ops", []) if cmd.get("cmd") == "batch" else [cmd]
+        if any(op.get("cmd") in ("spawn_entity", "destroy_entity") for op in ops):
+            _ENTITY_CACHE.ts = 0.0
+
+
+async def run_naive_commands(commands: list) -> list:
+    """Execute commands in order and return their responses.
+
+    Sends them as one `batch` request (one socket write, applied by the engine
+    in a single frame) and falls back to one request per command on engines
+    that predate `batch`.
+    """
+    if _CLIENT.supports_batch:
+        result = await send_naive_command({"cmd": "batch", "ops": commands})
+        if result.get("status") == "ok":
+            return result["data"]["results"]
+        if not result.get("message", "").startswith("Unknown command"):
+            return [result] * len(commands)
+        _CLIENT.supports_batch = False
+
+    return [await send_naive_command(cmd) for cmd in commands]
+
 
+@dataclass
+class EntityCache:
+    """Recent copy of the scene's entity list.
 
-def list_entities() -> list:
+    Reused for `ttl` seconds; send_naive_command() expires it whenever this
+    bridge spawns or destroys an entity.
+    """
+    ts: float = 0.0
+    data: list = field(default_factory=list)
+    ttl: float = 2.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def fresh(self) -> bool:
+        return time.monotonic() - self.ts < self.ttl
+
+
+_ENTITY_CACHE = EntityCache()
+
+
+async def list_entities() -> list:
     """Get all entities currently in the scene."""
-    result = send_naive_command({"cmd": "list_entities"})
-    if result.get("status") == "ok" and result.get("data"):
-        return result["data"].get("entities", [])
-    return []
+    if _ENTITY_CACHE.fresh():
+        return _ENTITY_CACHE.data
+    # Concurrent callers share a single refetch
+    async with _ENTITY_CACHE.lock:
+        if _ENTITY_CACHE.fresh():
+            return _ENTITY_CACHE.data
+        result = await send_naive_command({"cmd": "list_entities"})
+        if result.get("status") == "ok" and result.get("data"):
+            _ENTITY_CACHE.data = result["data"].get("entities", [])
+            _ENTITY_CACHE.ts = time.monotonic()
+            return _ENTITY_CACHE.data
+        return []
 
 
-def modify_entity(entity_id: str, components: dict) -> dict:
+async def modify_entity(entity_id: str, components: dict) -> dict:
     """Modify an entity's components."""
-    return send_naive_command({
+    return await send_naive_command({
         "cmd": "modify_entity",
         "entity_id": entity_id,
         "components": components,
     })
 
 
-def spawn_entity(entity_id: str, components: dict) -> dict:
+async def spawn_entity(entity_id: str, components: dict) -> dict:
     """Spawn a new entity."""
-    return send_naive_command({
+    return await send_naive_command({
         "cmd": "spawn_entity",
         "entity_id": entity_id,
         "components": components,
     })
 
 
-def emit_event(event_type: str, data: dict = None) -> dict:
+async def emit_event(event_type: str, data: dict = None) -> dict:
     """Emit an event on the event bus."""
-    return send_naive_command({
+    return await send_naive_command({
         "cmd": "emit_event",
         "event_type": event_type,
         "data": data or {},
@@ -106,150 +341,862 @@ def emit_event(event_type: str, data: dict = None) -> dict:
 # ─────────────────────────────────────────────────────────────
 
 SYSTEM_PROMPT = """You are a bridge between natural language commands and the nAIVE game engine.
-The engine is currently running a scene. You translate user requests into JSON commands.
+The engine is currently running a scene. You translate user requests into engine commands
+by calling the modify_entity, spawn_entity and destroy_entity tools.
 
-Available commands:
+Make one tool call per change; a request involving multiple changes needs multiple calls.
+Colors are [r, g, b] floats 0.0-1.0. Emission values can exceed 1.0 for bloom (e.g., [3.0, 0.5, 0.5]).
+Positions: the scene is centered at origin, radius ~10.
 
-1. modify_entity — Change an entity's properties
-   {"cmd": "modify_entity", "entity_id": "entity_name", "components": {
-     "point_light": {"color": [r, g, b], "intensity": float, "range": float},
-     "transform": {"position": [x, y, z]},
-     "material_override": {"emission": [r, g, b], "roughness": float, "metallic": float, "base_color": [r, g, b]}
-   }}
+For "rain", simulate by spawning several blue lights at various heights that flicker.
+For color changes, modify the lights and/or material overrides.
+Be creative but stay within the available tools.
+If the message is not a request to change the scene (thanks, questions, small talk),
+reply in one short sentence and call no tools.
 
-2. spawn_entity — Create a new entity
-   {"cmd": "spawn_entity", "entity_id": "unique_name", "components": {
-     "transform": {"position": [x, y, z], "scale": [sx, sy, sz]},
-     "point_light": {"color": [r, g, b], "intensity": float, "range": float},
-     "mesh_renderer": {"mesh": "procedural:sphere", "material": "assets/materials/chrome.yaml"}
-   }}
+Current entities in the scene (will be provided per-message)."""
 
-3. destroy_entity — Remove an entity
-   {"cmd": "destroy_entity", "entity_id": "entity_name"}
+MATERIALS = [
+    "chrome", "obsidian", "dark_mirror", "copper_ring", "steel_ring", "genesis_core",
+    "neon_pink", "neon_cyan", "neon_purple", "neon_gold", "neon_blue", "neon_green",
+    "neon_white", "neon_amber",
+]
 
-Available materials: chrome, obsidian, dark_mirror, copper_ring, steel_ring, genesis_core,
-neon_pink, neon_cyan, neon_purple, neon_gold, neon_blue, neon_green, neon_white, neon_amber.
-Material paths: "assets/materials/{name}.yaml"
+MESHES = ["procedural:sphere", "procedural:cube", "assets/meshes/cube.gltf"]
 
-Meshes: "procedural:sphere", "procedural:cube", "assets/meshes/cube.gltf"
+_VEC3 = {"type": "array", "items": {"type": "number"}, "minItems": 3, "maxItems": 3}
 
-Colors are [r, g, b] floats 0.0-1.0. Emission values can exceed 1.0 for bloom (e.g., [3.0, 0.5, 0.5]).
-Light intensity: 0-25. Light range: 1-30. Positions: the scene is centered at origin, radius ~10.
+_POINT_LIGHT = {
+    "type": "object",
+    "properties": {
+        "color": _VEC3,
+        "intensity": {"type": "number", "minimum": 0, "maximum": 25},
+        "range": {"type": "number", "minimum": 1, "maximum": 30},
+    },
+}
 
-IMPORTANT: Return ONLY a JSON array of commands. No explanation, no markdown. Just the JSON array.
-If the request involves multiple changes, return multiple commands in the array.
-For "rain", simulate by spawning several blue lights at various heights that flicker.
-For color changes, modify the lights and/or material overrides.
-Be creative but stay within the available command set.
+# The engine command vocabulary as tool schemas: each tool call is one engine
+# command ({"cmd": <tool name>, **input}).
+NAIVE_TOOLS = [
+    {
+        "name": "modify_entity",
+        "description": "Change an existing entity's properties.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "entity_id": {"type": "string"},
+                "components": {
+                    "type": "object",
+                    "properties": {
+                        "point_light": _POINT_LIGHT,
+                        "transform": {"type": "object", "properties": {"position": _VEC3}},
+                        "material_override": {
+                            "type": "object",
+                            "properties": {
+                                "emission": _VEC3,
+                                "roughness": {"type": "number"},
+                                "metallic": {"type": "number"},
+                                "base_color": _VEC3,
+                            },
+                        },
+                    },
+                },
+            },
+            "required": ["entity_id", "components"],
+        },
+    },
+    {
+        "name": "spawn_entity",
+        "description": "Create a new entity with a unique id.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "entity_id": {"type": "string"},
+                "components": {
+                    "type": "object",
+                    "properties": {
+                        "transform": {
+                            "type": "object",
+                            "properties": {"position": _VEC3, "scale": _VEC3},
+                        },
+                        "point_light": _POINT_LIGHT,
+                        "mesh_renderer": {
+                            "type": "object",
+                            "properties": {
+                                "mesh": {"type": "string", "enum": MESHES},
+                                "material": {
+                                    "type": "string",
+                                    "enum": [f"assets/materials/{name}.yaml" for name in MATERIALS],
+                                },
+                            },
+                            "required": ["mesh", "material"],
+                        },
+                    },
+                },
+            },
+            "required": ["entity_id", "components"],
+        },
+    },
+    {
+        "name": "destroy_entity",
+        "description": "Remove an entity from the scene.",
+        "input_schema": {
+            "type": "object",
+            "properties": {"entity_id": {"type": "string"}},
+            "required": ["entity_id"],
+        },
+    },
+]
 
-Current entities in the scene (will be provided per-message)."""
 
+_NUMBERED_ID = re.compile(r"^(.*?)(\d+)$")
+
+
+def summarize_entities(entities: list, limit: int = 400) -> str:
+    """Compact entity ID list for the prompt, e.g. "light_[001-050] (50), player, sun".
+
+    Numbered IDs sharing a prefix collapse into ranges so large scenes cost a
+    few tokens instead of one per entity. Capped at `limit` characters.
+
+    A bare ID never merges with numbered IDs sharing its prefix:
+
+    >>> summarize_entities([{"id": "cube"}, {"id": "cube2"}])
+    'cube, cube2'
+    >>> summarize_entities([{"id": "cube2"}, {"id": "cube"}])
+    'cube2, cube'
+    """
+    # (prefix, True) -> [(number, digits)] for numbered IDs; (id, False) -> None
+    groups = OrderedDict()
+    for e in entities:
+        entity_id = e.get("id", "?")
+        m = _NUMBERED_ID.match(entity_id)
+        if m:
+            groups.setdefault((m.group(1), True), []).append((int(m.group(2)), m.group(2)))
+        else:
+            groups.setdefault((entity_id, False), None)
 
-def ask_claude(user_message: str, entities: list) -> list:
-    """Ask Claude to interpret a natural language command into nAIVE commands."""
-    entity_summary = ", ".join([e.get("id", "?") for e in entities[:40]])
+    parts = []
+    for (prefix, _), numbers in groups.items():
+        if numbers is None:
+            parts.append(prefix)
+            continue
+        # a1 and a01 are different entities; keep each padding width apart
+        padded = {len(d) for _, d in numbers if len(d) > 1 and d[0] == "0"}
+        widths = OrderedDict()
+        for n in numbers:
+            widths.setdefault(len(n[1]) if len(n[1]) in padded else 0, []).append(n)
+        for members in widths.values():
+            if len(members) == 1:
+                parts.append(prefix + members[0][1])
+                continue
+            members.sort()
+            runs = [[members[0], members[0]]]
+            for n in members[1:]:
+                if n[0] == runs[-1][1][0] + 1:
+                    runs[-1][1] = n
+                else:
+                    runs.append([n, n])
+            spans = ",".join(a[1] if a == b else f"{a[1]}-{b[1]}" for a, b in runs)
+            parts.append(f"{prefix}[{spans}] ({len(members)})")
 
-    request_body = json.dumps({
-        "model": "claude-sonnet-4-5-20250929",
-        "max_tokens": 2048,
-        "system": SYSTEM_PROMPT,
+    kept, length = [], 0
+    for i, part in enumerate(parts):
+        remaining = len(parts) - i - 1
+        # Unless this is the last part, leave room for the "... (+N more)" marker
+        needed = length + len(part) + (len(f", ... (+{remaining} more)") if remaining else 0)
+        if needed > limit:
+            kept.append(f"... (+{len(parts) - i} more)")
+            break
+        kept.append(part)
+        length += len(part) + 2
+    return ", ".join(kept)
+
+
+def claude_user_content(user_message: str, entities: list) -> str:
+    """Per-message user turn: the current scene plus the request."""
+    return f"Scene entities: [{summarize_entities(entities)}]\n\nUser request: {user_message}"
+
+
+def claude_params(model: str, max_tokens: int, content: str) -> dict:
+    """Messages API parameters for one interpretation request."""
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "tools": NAIVE_TOOLS,
+        # Not "any": chat-style messages must be able to leave the scene alone
+        "tool_choice": {"type": "auto"},
+        # Marks the tools + system prefix for prompt caching. The API ignores
+        # this below the model's minimum cacheable length (1024 tokens for
+        # Sonnet 4.5, 4096 for Haiku 4.5), which the current prefix is well
+        # under; it only starts saving anything once the prompt grows past that.
+        "system": [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ],
         "messages": [
             {
                 "role": "user",
-                "content": f"Scene entities: [{entity_summary}]\n\nUser request: {user_message}"
+                "content": content,
             }
         ],
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        "https://api.anthropic.com/v1/messages",
-        data=request_body,
-        headers={
-            "Content-Type": "application/json",
-            "x-api-key": ANTHROPIC_KEY,
-            "anthropic-version": "2023-06-01",
-        },
-    )
+    }
+
+
+def tool_command(name: str, tool_input: dict) -> dict:
+    """Engine command for one tool call."""
+    return {"cmd": name, **tool_input}
+
+
+def parse_commands(message: dict) -> list:
+    """Extract the commands (tool calls) from a Messages API response.
+
+    An empty list means the message was not a command. Raises ValueError if
+    the reply was truncated.
+    """
+    if message.get("stop_reason") == "max_tokens":
+        raise ValueError("reply truncated at max_tokens")
+    return [
+        tool_command(block["name"], block["input"])
+        for block in message["content"] if block["type"] == "tool_use"
+    ]
+
+
+async def anthropic_request(method: str, path: str, body: dict = None, on_line=None) -> bytes:
+    """Call the Anthropic API and return the raw response body.
+
+    `on_line` streams the response instead (see HTTPSPool.request); it may
+    be called on a worker thread.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "x-api-key": ANTHROPIC_KEY,
+        "anthropic-version": "2023-06-01",
+    }
+    data = json_dumps(body) if body is not None else None
+    if ANTHROPIC_H2 is None:
+        status, raw = await asyncio.to_thread(
+            ANTHROPIC_HTTP.request, method, path, data, headers, timeout=30, on_line=on_line)
+    elif on_line is None:
+        resp = await ANTHROPIC_H2.request(method, path, content=data, headers=headers)
+        status, raw = resp.status_code, resp.content
+    else:
+        async with ANTHROPIC_H2.stream(method, path, content=data, headers=headers) as resp:
+            status, raw = resp.status_code, b""
+            if status == 200:
+                async for line in resp.aiter_lines():
+                    on_line(line.encode("utf-8"))
+            else:
+                raw = await resp.aread()
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}: {raw.decode('utf-8', 'replace')}")
+    return raw
+
+
+async def stream_claude_commands(model: str, max_tokens: int, content: str):
+    """Yield commands from a streamed Messages API reply as they complete.
+
+    Each tool_use block becomes a command as soon as its content_block_stop
+    arrives. A reply without tool calls (not a command) yields nothing.
+    Raises ValueError at the end if the reply was truncated.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def on_line(line: bytes):
+        # Server-sent events; hand the ones that build tool calls to the loop
+        if not line.startswith(b"data:"):
+            return
+        event = json_loads(line[5:])
+        if event.get("type") == "error":
+            raise RuntimeError(event["error"].get("message", "stream error"))
+        if event.get("type") in ("content_block_start", "content_block_delta",
+                                 "content_block_stop", "message_delta"):
+            loop.call_soon_threadsafe(events.put_nowait, event)
 
+    body = {**claude_params(model, max_tokens, content), "stream": True}
+    request = asyncio.ensure_future(anthropic_request("POST", "/v1/messages", body, on_line=on_line))
+    request.add_done_callback(lambda _: events.put_nowait(None))
+
+    tool_blocks = {}  # content block index -> (tool_use block, partial JSON chunks)
+    stop_reason = None
+    while (event := await events.get()) is not None:
+        kind = event["type"]
+        if kind == "content_block_start" and event["content_block"]["type"] == "tool_use":
+            tool_blocks[event["index"]] = (event["content_block"], [])
+        elif kind == "content_block_delta" and event["index"] in tool_blocks:
+            tool_blocks[event["index"]][1].append(event["delta"].get("partial_json", ""))
+        elif kind == "content_block_stop" and event["index"] in tool_blocks:
+            block, chunks = tool_blocks.pop(event["index"])
+            # Input streamed as JSON fragments is decoded once here; input that
+            # arrived whole with the block start is used as-is.
+            tool_input = json_loads("".join(chunks)) if chunks else block.get("input", {})
+            yield tool_command(block["name"], tool_input)
+        elif kind == "message_delta":
+            stop_reason = event["delta"].get("stop_reason")
+    await request
+
+    if stop_reason == "max_tokens":
+        raise ValueError("reply truncated at max_tokens")
+
+
+async def interpret_and_run(text: str, entities: list) -> tuple:
+    """Interpret a request and execute it on nAIVE.
+
+    Returns (commands, results, error); `error` is None unless the reply
+    failed or was cut off, in which case `commands` holds only what was
+    already applied. Fast-path matches and cache hits run as one batch.
+    Otherwise Claude's reply is streamed and each tool call is sent to the
+    engine the moment it completes, overlapping generation with execution.
+    """
+    commands = fast_path(text, entities)
+    if commands is not None:
+        return commands, await run_naive_commands(commands), None
+
+    commands, key = await _COMMAND_CACHE.lookup(text, entities)
+    if commands is not None:
+        return commands, await run_naive_commands(commands), None
+
+    content = claude_user_content(text, entities)
+    commands, results = [], []
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            text = data["content"][0]["text"].strip()
-            # Parse the JSON array of commands
-            commands = json.loads(text)
-            if isinstance(commands, dict):
-                commands = [commands]
-            return commands
+        try:
+            async for command in stream_claude_commands(CLAUDE_MODEL, CLAUDE_MAX_TOKENS, content):
+                commands.append(command)
+                results.append(await send_naive_command(command))
+        except ValueError as e:
+            if commands:
+                raise  # Already applied part of it; don't replay on another model
+            # Unparseable or truncated output: retry once on the larger model.
+            # A reply with no tool calls is not an error and never gets here.
+            print(f"  [Claude] {CLAUDE_MODEL} reply unusable ({e}), retrying with {CLAUDE_FALLBACK_MODEL}")
+            async for command in stream_claude_commands(CLAUDE_FALLBACK_MODEL, CLAUDE_MAX_TOKENS, content):
+                commands.append(command)
+                results.append(await send_naive_command(command))
     except Exception as e:
+        # Never cache a partial run; a retry should ask Claude again
         print(f"  [Claude API error] {e}")
-        return []
+        return commands, results, str(e)
+
+    if commands:
+        _COMMAND_CACHE.store(key, commands)
+    return commands, results, None
 
 
 # ─────────────────────────────────────────────────────────────
-# Telegram Bot Polling
+# Fast path — fixed-vocabulary requests answered without Claude
+# ─────────────────────────────────────────────────────────────
+
+COLOR_NAMES = {
+    "red": [1.0, 0.1, 0.1], "green": [0.1, 1.0, 0.2], "blue": [0.1, 0.3, 1.0],
+    "white": [1.0, 1.0, 1.0], "yellow": [1.0, 0.9, 0.2], "orange": [1.0, 0.5, 0.1],
+    "purple": [0.6, 0.1, 1.0], "pink": [1.0, 0.3, 0.7], "cyan": [0.1, 0.9, 1.0],
+}
+
+SUNRISE_PALETTE = [[1.0, 0.55, 0.2], [1.0, 0.7, 0.35], [1.0, 0.45, 0.15], [1.0, 0.8, 0.5]]
+
+
+def light_ids(entities: list):
+    """IDs of entities with a PointLight component.
+
+    None when the engine's list_entities doesn't report point_light (older
+    engines); names alone miss lights like `sun`, so those requests go to Claude.
+    """
+    if not entities or any("point_light" not in e for e in entities):
+        return None
+    return [e["id"] for e in entities if e["point_light"]]
+
+
+def _light_commands(entities: list, light_for) -> list:
+    """One point_light modify per light; `light_for(i)` gives its settings."""
+    return [
+        {"cmd": "modify_entity", "entity_id": entity_id, "components": {"point_light": light_for(i)}}
+        for i, entity_id in enumerate(light_ids(entities) or [])
+    ]
+
+
+def _lights_color(match, entities: list) -> list:
+    color = COLOR_NAMES[match.group(1).lower()]
+    return _light_commands(entities, lambda i: {"color": color})
+
+
+def _lights_off(match, entities: list) -> list:
+    return _light_commands(entities, lambda i: {"intensity": 0.0})
+
+
+def _sunrise(match, entities: list) -> list:
+    return _light_commands(entities, lambda i: {
+        "color": SUNRISE_PALETTE[i % len(SUNRISE_PALETTE)], "intensity": 12.0, "range": 20.0,
+    })
+
+
+def _chaos(match, entities: list) -> list:
+    return _light_commands(entities, lambda i: {
+        "color": [round(random.random(), 2) for _ in range(3)],
+        "intensity": round(random.uniform(2.0, 25.0), 1),
+    })
+
+
+FAST_PATTERNS = [
+    (re.compile(r"(?i)^(?:make |turn |set )?(?:all )?(?:the )?lights? (?:to )?("
+                + "|".join(COLOR_NAMES) + r")$"), _lights_color),
+    (re.compile(r"(?i)^(?:turn )?(?:all )?(?:the )?lights? off$"), _lights_off),
+    (re.compile(r"(?i)^sunrise$"), _sunrise),
+    (re.compile(r"(?i)^chaos(?: mode)?$"), _chaos),
+]
+
+_fast_path_stats = {"hits": 0, "total": 0}
+
+
+def fast_path(text: str, entities: list):
+    """Commands for a fixed-vocabulary request, or None to ask Claude."""
+    normalized = " ".join(text.strip(" .!").split())
+    _fast_path_stats["total"] += 1
+    for pattern, handler in FAST_PATTERNS:
+        match = pattern.match(normalized)
+        if match:
+            commands = handler(match, entities)
+            if commands:
+                _fast_path_stats["hits"] += 1
+                print(f"  [Fast path] hit ({_fast_path_stats['hits']}/{_fast_path_stats['total']})")
+                return commands
+    print(f"  [Fast path] miss ({_fast_path_stats['hits']}/{_fast_path_stats['total']} hits so far)")
+    return None
+
+
+# ─────────────────────────────────────────────────────────────
+# Command cache — skip Claude for requests it has already answered
+# ─────────────────────────────────────────────────────────────
+
+def normalize_request(text: str) -> str:
+    """Case- and whitespace-insensitive form of a request, for cache keys."""
+    return " ".join(text.lower().split())
+
+
+class CommandCache:
+    """Two-tier cache of Claude interpretations, keyed by scene contents.
+
+    Tier 1 is an exact-text LRU. Tier 2 (optional) matches paraphrases by
+    embedding cosine similarity over a bounded window of recent requests.
+    Entries only match while the scene's entity set is unchanged.
+    """
+
+    def __init__(self, maxsize: int = 256, semantic_size: int = 128,
+                 threshold: float = 0.92, model_name: str = ""):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._exact = OrderedDict()
+        self._recent = deque(maxlen=semantic_size)
+        self._model = None
+        if model_name and SentenceTransformer is not None:
+            self._model = SentenceTransformer(model_name)
+        elif model_name:
+            print("  [Cache] sentence-transformers not installed; semantic cache disabled")
+
+    async def lookup(self, text: str, entities: list) -> tuple:
+        """Return (cached commands or None, key to store() a fresh answer under)."""
+        scene = hash(frozenset(e.get("id") for e in entities))
+        normalized = normalize_request(text)
+
+        commands = self._exact.get((normalized, scene))
+        if commands is not None:
+            self._exact.move_to_end((normalized, scene))
+            print("  [Cache] exact hit")
+            return list(commands), None
+
+        embedding = None
+        if self._model is not None:
+            embedding = await asyncio.to_thread(
+                self._model.encode, normalized, normalize_embeddings=True)
+            best, best_score = None, self.threshold
+            for entry_scene, entry_embedding, entry_commands in self._recent:
+                score = float(embedding @ entry_embedding)
+                if entry_scene == scene and score >= best_score:
+                    best, best_score = entry_commands, score
+            if best is not None:
+                print(f"  [Cache] semantic hit ({best_score:.2f})")
+                self.store((normalized, scene, embedding), best)
+                return list(best), None
+
+        return None, (normalized, scene, embedding)
+
+    def store(self, key: tuple, commands: list):
+        normalized, scene, embedding = key
+        commands = tuple(commands)
+        self._exact[(normalized, scene)] = commands
+        self._exact.move_to_end((normalized, scene))
+        if len(self._exact) > self.maxsize:
+            self._exact.popitem(last=False)
+        if embedding is not None:
+            self._recent.append((scene, embedding, commands))
+
+
+_COMMAND_CACHE = CommandCache(model_name=SEMANTIC_CACHE_MODEL)
+
+
+# ─────────────────────────────────────────────────────────────
+# Message Batches API — deferred, half-price interpretation
+# ─────────────────────────────────────────────────────────────
+
+_batch_db = None
+
+
+def batch_db() -> sqlite3.Connection:
+    """The pending-batch store, opened (and its table created) on first use."""
+    global _batch_db
+    if _batch_db is None:
+        _batch_db = sqlite3.connect(BATCH_DB)
+        _batch_db.execute(
+            "CREATE TABLE IF NOT EXISTS pending_batches ("
+            " batch_id TEXT PRIMARY KEY, chat_id INTEGER NOT NULL, created REAL NOT NULL)"
+        )
+    return _batch_db
+
+
+async def queue_batch(chat_id: int, prompts: list):
+    """Submit prompts to the Message Batches API and remember the batch.
+
+    Results are applied by poll_batches() once Anthropic finishes processing,
+    typically within minutes, at half the token price.
+    """
+    entities = await list_entities()
+    requests = [
+        {
+            "custom_id": f"msg-{i}",
+            "params": claude_params(CLAUDE_MODEL, CLAUDE_MAX_TOKENS, claude_user_content(prompt, entities)),
+        }
+        for i, prompt in enumerate(prompts)
+    ]
+    try:
+        raw = await anthropic_request("POST", "/v1/messages/batches", {"requests": requests})
+        batch_id = json_loads(raw)["id"]
+    except Exception as e:
+        print(f"  [Batch error] {e}")
+        await send_telegram_message(chat_id, "Could not queue the batch. Try again without /batch.")
+        return
+
+    with batch_db() as db:
+        db.execute("INSERT INTO pending_batches VALUES (?, ?, ?)", (batch_id, chat_id, time.time()))
+    print(f"  [Batch] Queued {batch_id} ({len(prompts)} request(s))")
+    await send_telegram_message(chat_id, f"Batch {batch_id} queued. Results will be applied when it finishes.")
+
+
+async def apply_batch_results(batch_id: str, chat_id: int, results_url: str):
+    """Download a finished batch's results and execute them in prompt order."""
+    path = "/" + results_url.split("://", 1)[-1].split("/", 1)[1]
+    raw = await anthropic_request("GET", path)
+    entries = [json_loads(line) for line in raw.splitlines() if line.strip()]
+    entries.sort(key=lambda entry: int(entry["custom_id"].split("-")[1]))
+
+    reports = []
+    for entry in entries:
+        result = entry["result"]
+        try:
+            if result["type"] != "succeeded":
+                raise ValueError(result["type"])
+            commands = parse_commands(result["message"])
+        except (KeyError, ValueError) as e:
+            reports.append(f"{entry['custom_id']}: could not interpret ({e})")
+            continue
+        if not commands:
+            reports.append(f"{entry['custom_id']}: not a scene command, nothing applied")
+            continue
+        reports.append(format_results(commands, await run_naive_commands(commands)))
+
+    await send_telegram_message(chat_id, f"Batch {batch_id} applied:\n" + "\n".join(reports))
+
+
+async def poll_batches():
+    """Background task: apply pending batches as Anthropic finishes them."""
+    while True:
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        with batch_db() as db:
+            pending = db.execute("SELECT batch_id, chat_id FROM pending_batches").fetchall()
+        for batch_id, chat_id in pending:
+            try:
+                raw = await anthropic_request("GET", f"/v1/messages/batches/{batch_id}")
+                batch = json_loads(raw)
+                if batch["processing_status"] != "ended":
+                    continue
+                await apply_batch_results(batch_id, chat_id, batch["results_url"])
+            except Exception as e:
+                print(f"  [Batch error] {batch_id}: {e}")
+                continue
+            with batch_db() as db:
+                db.execute("DELETE FROM pending_batches WHERE batch_id = ?", (batch_id,))
+
+
+# ─────────────────────────────────────────────────────────────
+# Telegram Bot API
 # ─────────────────────────────────────────────────────────────
 
 def telegram_request(method: str, params: dict = None) -> dict:
-    """Make a request to the Telegram Bot API."""
-    url = f"{TELEGRAM_API}/{method}"
-    if params:
-        data = json.dumps(params).encode("utf-8")
-        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
-    else:
-        req = urllib.request.Request(url)
+    """Make a request to the Telegram Bot API.
+
+    On 429 (rate limited) it waits out Telegram's `retry_after` before
+    returning the failure, so callers don't retry straight into the limit.
+    """
+    path = f"{TELEGRAM_PATH}/{method}"
     try:
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8") if e.fp else ""
-        print(f"  [Telegram API error] {e.code}: {body}")
-        return {"ok": False}
+        if params:
+            data = json_dumps(params)
+            status, body = TELEGRAM_HTTP.request(
+                "POST", path, data, {"Content-Type": "application/json"})
+        else:
+            status, body = TELEGRAM_HTTP.request("GET", path)
+        if status != 200:
+            print(f"  [Telegram API error] {status}: {body.decode('utf-8', 'replace')}")
+            try:
+                error = json_loads(body)
+            except ValueError:
+                return {"ok": False}
+            retry_after = error.get("parameters", {}).get("retry_after")
+            if status == 429 and retry_after:
+                time.sleep(retry_after)
+            return {"ok": False, "description": error.get("description", "")}
+        return json_loads(body)
     except Exception as e:
         print(f"  [Telegram error] {e}")
         return {"ok": False}
 
 
-def send_telegram_message(chat_id: int, text: str):
+async def send_telegram_message(chat_id: int, text: str):
     """Send a message back to the Telegram chat."""
-    telegram_request("sendMessage", {"chat_id": chat_id, "text": text})
+    await asyncio.to_thread(telegram_request, "sendMessage", {"chat_id": chat_id, "text": text})
+
 
+# (chat_id, normalized text) -> task running that request
+_inflight = {}
 
-def process_message(chat_id: int, text: str):
-    """Process an incoming Telegram message: interpret via Claude, execute on nAIVE."""
+
+async def process_message(chat_id: int, text: str):
+    """Process an incoming Telegram message: interpret via Claude, execute on nAIVE.
+
+    The "Processing..." acknowledgement is returned by handle_update() and
+    delivered concurrently with this.
+    """
     print(f"  [Telegram] Received: {text!r}")
 
     # Check nAIVE is running
-    entities = list_entities()
+    entities = await list_entities()
     if not entities:
-        send_telegram_message(chat_id, "nAIVE engine is not running or no scene loaded.")
+        await send_telegram_message(chat_id, "nAIVE engine is not running or no scene loaded.")
         return
 
-    send_telegram_message(chat_id, f"Processing: \"{text}\"...")
-
-    # Ask Claude to interpret
-    commands = ask_claude(text, entities)
+    # Interpret (cache or streamed Claude reply) and execute as commands arrive.
+    # A duplicate of a request still in flight for this chat (e.g. a mobile
+    # double-tap) joins it instead of asking Claude and executing twice.
+    key = (chat_id, normalize_request(text))
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(interpret_and_run(text, entities))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        # The caller that started the task reports its results; a second
+        # report would read as if the commands had run twice.
+        print("  [Single-flight] joining identical in-flight request")
+        await send_telegram_message(chat_id, "Same request is already running; results will be reported once.")
+        return
+    commands, results, error = await asyncio.shield(task)
     if not commands:
-        send_telegram_message(chat_id, "Could not interpret that command. Try something like \"make the lights blue\" or \"add a spotlight\".")
+        await send_telegram_message(chat_id, "Could not interpret that command. Try something like \"make the lights blue\" or \"add a spotlight\".")
         return
 
-    # Execute each command
-    results = []
-    for cmd in commands:
-        result = send_naive_command(cmd)
+    report = format_results(commands, results)
+    if error is not None:
+        report = (f"Claude's reply was cut off ({error}); only the first "
+                  f"{len(commands)} command(s) were applied.\n{report}")
+    await send_telegram_message(chat_id, report)
+
+
+def format_results(commands: list, results: list) -> str:
+    """Per-command status report for the chat (also echoed to the console)."""
+    lines = []
+    for cmd, result in zip(commands, results):
         status = result.get("status", "unknown")
         cmd_type = cmd.get("cmd", "?")
         entity = cmd.get("entity_id", "?")
-        results.append(f"  {cmd_type} {entity}: {status}")
+        lines.append(f"  {cmd_type} {entity}: {status}")
         print(f"    -> {cmd_type} {entity}: {status}")
 
-    summary = "\n".join(results)
-    send_telegram_message(
-        chat_id,
-        f"Executed {len(commands)} command(s) on nAIVE:\n{summary}"
+    summary = "\n".join(lines)
+    return f"Executed {len(commands)} command(s) on nAIVE:\n{summary}"
+
+
+async def handle_update(update: dict) -> tuple:
+    """Route one Telegram update.
+
+    Returns (reply, work): `reply` is sendMessage params to deliver right away
+    (or None), `work` is a follow-up coroutine to run alongside it (or None).
+    """
+    msg = update.get("message", {})
+    text = msg.get("text", "").strip()
+    chat_id = msg.get("chat", {}).get("id")
+
+    if not text or not chat_id:
+        return None, None
+
+    if text.startswith("/start"):
+        return {
+            "chat_id": chat_id,
+            "text": (
+                f"nAIVE Engine Control\n\n"
+                f"Send me natural language commands and I'll control the running nAIVE engine in real-time.\n\n"
+                f"Examples:\n"
+                f"  \"make it rain\"\n"
+                f"  \"turn all lights red\"\n"
+                f"  \"add a giant glowing sphere\"\n"
+                f"  \"make everything dark\"\n"
+                f"  \"sunrise\"\n"
+                f"  \"chaos mode\"\n"
+                f"  \"spawn a neon cube at the center\"\n\n"
+                f"Not in a hurry? Prefix with /batch (one request per line) to run it\n"
+                f"through the Batch API at half the cost; results arrive within minutes.\n"
+            ),
+        }, None
+
+    if text.startswith("/batch"):
+        prompts = [line.strip() for line in text[len("/batch"):].splitlines() if line.strip()]
+        if not prompts:
+            return {"chat_id": chat_id, "text": "Usage: /batch <request>, one request per line."}, None
+        return (
+            {"chat_id": chat_id, "text": f"Queuing {len(prompts)} request(s) for batch processing..."},
+            queue_batch(chat_id, prompts),
+        )
+
+    if text.startswith("/entities"):
+        entities = await list_entities()
+        names = [e.get("id", "?") for e in entities]
+        return {
+            "chat_id": chat_id,
+            "text": f"Scene entities ({len(names)}):\n" + "\n".join(names),
+        }, None
+
+    return (
+        {"chat_id": chat_id, "text": f"Processing: \"{text}\"..."},
+        process_message(chat_id, text),
     )
 
 
-def main():
+# ─────────────────────────────────────────────────────────────
+# Update delivery — webhook (push) or long polling (pull)
+# ─────────────────────────────────────────────────────────────
+
+# Strong references to in-flight update tasks (the event loop only keeps weak ones)
+_background_tasks = set()
+
+
+def spawn(coro):
+    """Run a coroutine in the background on the current event loop."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Receives updates pushed by Telegram to POST /webhook/<secret>.
+
+    Runs on http.server threads; update handling is handed to the event loop.
+    """
+
+    loop: asyncio.AbstractEventLoop = None
+
+    def do_POST(self):
+        token = self.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if (self.path != f"/webhook/{WEBHOOK_SECRET}"
+                or not hmac.compare_digest(token.encode("utf-8"), WEBHOOK_SECRET.encode("utf-8"))):
+            self.send_error(403)
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            update = json_loads(self.rfile.read(length))
+        except ValueError:
+            self.send_error(400)
+            return
+
+        reply, work = asyncio.run_coroutine_threadsafe(handle_update(update), self.loop).result()
+        if work:
+            self.loop.call_soon_threadsafe(spawn, work)
+
+        # Answer with 200 right away so Telegram does not retry. The first reply
+        # rides back in the response body as a Bot API call, saving a round trip.
+        body = json_dumps({"method": "sendMessage", **reply}) if reply else b""
+        self.send_response(200)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console to the bridge's own log lines
+
+
+async def run_webhook():
+    """Register the webhook with Telegram and serve pushed updates."""
+    result = await asyncio.to_thread(telegram_request, "setWebhook", {
+        "url": f"{WEBHOOK_URL.rstrip('/')}/webhook/{WEBHOOK_SECRET}",
+        "secret_token": WEBHOOK_SECRET,
+        "allowed_updates": ["message"],
+    })
+    if not result.get("ok"):
+        print("ERROR: Could not register Telegram webhook")
+        sys.exit(1)
+
+    WebhookHandler.loop = asyncio.get_running_loop()
+    server = ThreadingHTTPServer(("0.0.0.0", WEBHOOK_PORT), WebhookHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"  Webhook: {WEBHOOK_URL} -> :{WEBHOOK_PORT}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def deliver(reply: dict, work):
+    """Send the immediate reply while the follow-up work already runs."""
+    jobs = []
+    if reply:
+        jobs.append(asyncio.to_thread(telegram_request, "sendMessage", reply))
+    if work:
+        jobs.append(work)
+    await asyncio.gather(*jobs)
+
+
+async def run_polling():
+    """Fetch updates with getUpdates long polling and handle them concurrently."""
+    # getUpdates is rejected while a webhook is registered
+    await asyncio.to_thread(telegram_request, "deleteWebhook")
+
+    offset = 0
+    backoff = 1.0
+    while True:
+        try:
+            updates = await asyncio.to_thread(telegram_request, "getUpdates", {
+                "offset": offset,
+                "timeout": 30,
+                "allowed_updates": ["message"],
+            })
+            if not updates.get("ok"):
+                raise RuntimeError(updates.get("description") or "getUpdates failed")
+            backoff = 1.0
+
+            for update in updates.get("result", []):
+                offset = update["update_id"] + 1
+                reply, work = await handle_update(update)
+                spawn(deliver(reply, work))
+
+        except Exception as e:
+            # Exponential backoff with jitter so many bridges don't retry in lockstep
+            delay = backoff * random.uniform(0.5, 1.5)
+            print(f"  [Poll error] {e} (retrying in {delay:.1f}s)")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, 60.0)
+
+
+async def main():
     if not TELEGRAM_TOKEN:
         print("ERROR: Set TELEGRAM_BOT_TOKEN environment variable")
         print("  1. Message @BotFather on Telegram")
@@ -263,7 +1210,7 @@ def main():
         sys.exit(1)
 
     # Verify bot token
-    me = telegram_request("getMe")
+    me = await asyncio.to_thread(telegram_request, "getMe")
     if not me.get("ok"):
         print("ERROR: Invalid Telegram bot token")
         sys.exit(1)
@@ -275,57 +1222,16 @@ def main():
     print(f"  Send messages to @{bot_name} on Telegram to control nAIVE!")
     print()
 
-    # Long polling loop
-    offset = 0
-    while True:
-        try:
-            updates = telegram_request("getUpdates", {
-                "offset": offset,
-                "timeout": 30,
-                "allowed_updates": ["message"],
-            })
+    spawn(poll_batches())
 
-            if updates.get("ok") and updates.get("result"):
-                for update in updates["result"]:
-                    offset = update["update_id"] + 1
-                    msg = update.get("message", {})
-                    text = msg.get("text", "").strip()
-                    chat_id = msg.get("chat", {}).get("id")
-
-                    if not text or not chat_id:
-                        continue
-
-                    if text.startswith("/start"):
-                        send_telegram_message(
-                            chat_id,
-                            f"nAIVE Engine Control\n\n"
-                            f"Send me natural language commands and I'll control the running nAIVE engine in real-time.\n\n"
-                            f"Examples:\n"
-                            f"  \"make it rain\"\n"
-                            f"  \"turn all lights red\"\n"
-                            f"  \"add a giant glowing sphere\"\n"
-                            f"  \"make everything dark\"\n"
-                            f"  \"sunrise\"\n"
-                            f"  \"chaos mode\"\n"
-                            f"  \"spawn a neon cube at the center\"\n"
-                        )
-                        continue
-
-                    if text.startswith("/entities"):
-                        entities = list_entities()
-                        names = [e.get("id", "?") for e in entities]
-                        send_telegram_message(chat_id, f"Scene entities ({len(names)}):\n" + "\n".join(names))
-                        continue
-
-                    process_message(chat_id, text)
-
-        except KeyboardInterrupt:
-            print("\nShutting down.")
-            break
-        except Exception as e:
-            print(f"  [Poll error] {e}")
-            time.sleep(2)
+    if WEBHOOK_URL:
+        await run_webhook()
+    else:
+        await run_polling()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nShutting down.")